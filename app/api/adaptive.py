@@ -9,6 +9,7 @@ from sqlalchemy.orm import selectinload
 
 from app.core.deps import DBSession, AuthUser
 from app.core.errors import NotFoundError, ValidationError
+from app.models.question import Question
 from app.models.quiz import Quiz
 from app.models.submission import Submission
 from app.schemas.auth import CurrentUser
@@ -41,12 +42,37 @@ async def get_next_question(
     if not quiz.adaptive:
         raise ValidationError("This quiz is not configured for adaptive mode")
     
+    adaptive_service = AdaptiveService()
+    
+    # A submitted quiz has no further questions to serve; retakes go through
+    # POST /quizzes/{id}/retry, which copies the quiz
+    completed_query = select(Submission).options(
+        selectinload(Submission.answers)
+    ).where(
+        Submission.user_id == current_user.id,
+        Submission.quiz_id == quiz_id,
+        Submission.is_completed == True
+    ).order_by(Submission.submitted_at.desc()).limit(1)
+    
+    completed_result = await db.execute(completed_query)
+    completed_submission = completed_result.scalar_one_or_none()
+    
+    if completed_submission:
+        logger.info("Adaptive quiz already completed", submission_id=completed_submission.id, quiz_id=quiz_id)
+        return NextQuestionResponse(
+            question=None,
+            is_complete=True,
+            progress=adaptive_service._calculate_progress(
+                list(quiz.questions), list(completed_submission.answers)
+            )
+        )
+    
     # Get or create active submission for this user
     submission_query = select(Submission).where(
         Submission.user_id == current_user.id,
         Submission.quiz_id == quiz_id,
         Submission.is_completed == False
-    ).order_by(Submission.created_at.desc())
+    ).order_by(Submission.created_at.desc()).limit(1)
     
     submission_result = await db.execute(submission_query)
     submission = submission_result.scalar_one_or_none()
@@ -59,12 +85,12 @@ async def get_next_question(
             is_completed=False,
         )
         db.add(submission)
-        await db.flush()
+        # Commit so /adaptive-status and later /next calls see the session
+        await db.commit()
         
         logger.info("Created new adaptive submission", submission_id=submission.id, quiz_id=quiz_id)
     
     # Use adaptive service to get next question
-    adaptive_service = AdaptiveService()
     next_question_data = await adaptive_service.get_next_question(
         session=db,
         submission=submission,
@@ -116,7 +142,7 @@ async def get_adaptive_status(
         Submission.user_id == current_user.id,
         Submission.quiz_id == quiz_id,
         Submission.is_completed == False
-    ).order_by(Submission.created_at.desc())
+    ).order_by(Submission.created_at.desc()).limit(1)
     
     submission_result = await db.execute(submission_query)
     submission = submission_result.scalar_one_or_none()
@@ -133,7 +159,7 @@ async def get_adaptive_status(
     adaptive_service = AdaptiveService()
     
     # Get all questions for progress calculation
-    questions_query = select(quiz.questions)
+    questions_query = select(Question).where(Question.quiz_id == quiz_id)
     questions_result = await db.execute(questions_query)
     all_questions = questions_result.scalars().all()
     
@@ -1,8 +1,5 @@
 """Hint endpoints for quiz questions."""
 
-from collections import defaultdict
-from typing import Dict
-
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
@@ -16,13 +13,11 @@ from app.models.answer import Answer
 from app.schemas.auth import CurrentUser
 from app.schemas.question import HintRequest, HintResponse
 from app.services.ai.provider import get_ai_provider
+from app.services.hint_usage import hint_usage_store
 
 router = APIRouter()
 logger = structlog.get_logger()
 
-# In-memory rate limiting (in production, use Redis or database)
-hint_usage: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
-
 
 @router.post("/{quiz_id}/questions/{question_id}/hint", response_model=HintResponse)
 async def get_hint(
@@ -36,78 +31,84 @@ async def get_hint(
     
     settings = get_settings()
     
-    # Check rate limit
-    user_key = f"{current_user.id}"
-    current_usage = hint_usage[user_key][question_id]
-    
-    if current_usage >= settings.hint_rate_limit_per_user_question:
+    # Check rate limit and reserve the hint before any await
+    hints_used = hint_usage_store.reserve(
+        current_user.id, question_id, settings.hint_rate_limit_per_user_question
+    )
+    if hints_used is None:
         raise RateLimitError(
-            f"Hint limit exceeded for this question. Maximum {settings.hint_rate_limit_per_user_question} hints allowed."
+            f"Hint rate limit exceeded for this question. Maximum {settings.hint_rate_limit_per_user_question} hints allowed."
         )
     
-    # Get question
-    query = select(Question).where(
-        Question.id == question_id,
-        Question.quiz_id == quiz_id
-    )
-    result = await db.execute(query)
-    question = result.scalar_one_or_none()
-    
-    if not question:
-        raise NotFoundError("Question not found")
-    
-    # Generate hint using AI
-    ai_provider = get_ai_provider()
+    remaining_hints = settings.hint_rate_limit_per_user_question - hints_used
     
+    # Give the reserved hint back on any failure, cancellation included
+    hint_served = False
     try:
-        hint_text = await ai_provider.hint(
-            question=question.question_text,
-            question_type=question.question_type,
-            difficulty=question.difficulty,
-            topic=question.topic,
+        # Get question
+        query = select(Question).where(
+            Question.id == question_id,
+            Question.quiz_id == quiz_id
         )
+        result = await db.execute(query)
+        question = result.scalar_one_or_none()
         
-        # Update rate limit counter
-        hint_usage[user_key][question_id] += 1
-        hints_used = hint_usage[user_key][question_id]
-        remaining_hints = settings.hint_rate_limit_per_user_question - hints_used
+        if not question:
+            raise NotFoundError("Question not found")
         
-        # Update hint usage in any existing answer
-        answer_query = select(Answer).where(
-            Answer.question_id == question_id,
-            Answer.submission_id.in_(
-                # Get submissions for this user and quiz
-                select(Answer.submission_id)
-                .join(Answer.submission)
-                .where(Answer.submission.has(user_id=current_user.id))
-            )
-        )
-        answer_result = await db.execute(answer_query)
-        existing_answer = answer_result.scalar_one_or_none()
+        # Generate hint using AI
+        ai_provider = get_ai_provider()
         
-        if existing_answer:
-            existing_answer.hints_used = hints_used
-            await db.commit()
+        try:
+            hint_text = await ai_provider.hint(
+                question=question.question_text,
+                question_type=question.question_type,
+                difficulty=question.difficulty,
+                topic=question.topic,
+            )
+            
+            # Update hint usage in any existing answer
+            answer_query = select(Answer).where(
+                Answer.question_id == question_id,
+                Answer.submission_id.in_(
+                    # Get submissions for this user and quiz
+                    select(Answer.submission_id)
+                    .join(Answer.submission)
+                    .where(Answer.submission.has(user_id=current_user.id))
+                )
+            )
+            answer_result = await db.execute(answer_query)
+            existing_answer = answer_result.scalar_one_or_none()
+            
+            if existing_answer:
+                existing_answer.hints_used = hints_used
+                await db.commit()
         
-        logger.info(
-            "Hint provided", 
-            user_id=current_user.id, 
-            question_id=question_id,
-            hints_used=hints_used
-        )
+        except Exception as e:
+            logger.error("Failed to generate hint", error=str(e), question_id=question_id)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to generate hint"
+            )
         
-        return HintResponse(
-            hint=hint_text,
-            hints_used=hints_used,
-            remaining_hints=remaining_hints,
-        )
+        hint_served = True
     
-    except Exception as e:
-        logger.error("Failed to generate hint", error=str(e), question_id=question_id)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate hint"
-        )
+    finally:
+        if not hint_served:
+            hint_usage_store.release(current_user.id, question_id)
+    
+    logger.info(
+        "Hint provided", 
+        user_id=current_user.id, 
+        question_id=question_id,
+        hints_used=hints_used
+    )
+    
+    return HintResponse(
+        hint=hint_text,
+        hints_used=hints_used,
+        remaining_hints=remaining_hints,
+    )
 
 
 @router.delete("/{quiz_id}/questions/{question_id}/hint-usage")
@@ -121,16 +122,14 @@ async def reset_hint_usage(
     
     settings = get_settings()
     
-    # Only allow in development mode
-    if not settings.is_development:
+    # Only allow in development and test mode
+    if not (settings.is_development or settings.is_testing):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="This endpoint is only available in development mode"
+            detail="This endpoint is only available in development and test mode"
         )
     
-    user_key = f"{current_user.id}"
-    if question_id in hint_usage[user_key]:
-        del hint_usage[user_key][question_id]
+    hint_usage_store.reset(current_user.id, question_id)
     
     logger.info("Hint usage reset", user_id=current_user.id, question_id=question_id)
     
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.deps import DBSession, AuthUser
+from app.core.errors import ValidationError
 from app.models.submission import Submission
 from app.models.quiz import Quiz
 from app.schemas.auth import CurrentUser
@@ -79,7 +80,7 @@ async def get_quiz_history(
             query = query.where(Submission.submitted_at >= start_date)
             count_query = count_query.where(Submission.submitted_at >= start_date)
             filters_applied["from_date"] = from_date
-        except ValueError as e:
+        except (ValueError, ValidationError) as e:
             logger.error("Invalid from_date format", error=str(e))
             # Continue without this filter
     
@@ -89,7 +90,7 @@ async def get_quiz_history(
             query = query.where(Submission.submitted_at <= end_date)
             count_query = count_query.where(Submission.submitted_at <= end_date)
             filters_applied["to_date"] = to_date
-        except ValueError as e:
+        except (ValueError, ValidationError) as e:
             logger.error("Invalid to_date format", error=str(e))
             # Continue without this filter
     
@@ -109,7 +110,7 @@ async def get_quiz_history(
                 )
             )
             filters_applied["completed_date"] = completed_date
-        except ValueError as e:
+        except (ValueError, ValidationError) as e:
             logger.error("Invalid completed_date format", error=str(e))
             # Continue without this filter
     
@@ -1,42 +1,51 @@
 """Quiz management endpoints."""
 
+from typing import Annotated
+
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import TypeAdapter, ValidationError as PydanticValidationError
 from sqlalchemy import select, delete, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.deps import DBSession, AuthUser
-from app.core.errors import NotFoundError, ValidationError, AppError
+from app.core.errors import AIServiceError, NotFoundError, ValidationError, AppError
 from app.models.quiz import Quiz
 from app.models.question import Question
 from app.models.submission import Submission
 from app.models.answer import Answer
-from app.models.evaluation import Evaluation
 from app.models.retry import Retry
 from app.models.user import User
 from app.schemas.auth import CurrentUser
-from app.schemas.quiz import QuizCreate, QuizResponse, QuizSummary, QuizRetryRequest, QuizRetryResponse
+from app.schemas.quiz import QuizCreate, QuizCreateResponse, QuizResponse, QuizSummary, QuizRetryRequest, QuizRetryResponse
 from app.schemas.question import QuestionResponse
-from app.schemas.submission import QuizSubmission, SubmissionEvaluation
+from app.schemas.submission import AnswerEvaluation, QuizSubmission, SubmissionEvaluation
 from app.services.ai.provider import get_ai_provider
 from app.services.grading import GradingService
 from app.services.datetime import get_utc_now
 from app.services.cache import get_cache, CacheService
 from app.services.notifications import notification_service
 from app.services.leaderboard import get_leaderboard_service
+from app.services.quiz_records import build_questions, record_evaluation
 
 router = APIRouter()
 logger = structlog.get_logger()
 
+# The submit response is built with model_construct, which skips validation, so
+# the provider-written suggestions are held to the schema's limits on their own
+_suggestions_adapter = TypeAdapter(
+    Annotated[list[str], SubmissionEvaluation.model_fields["suggestions"]]
+)
+
 
-@router.post("", response_model=QuizResponse)
+@router.post("", response_model=QuizCreateResponse)
 async def create_quiz(
     quiz_data: QuizCreate,
     current_user: AuthUser,
     db: DBSession,
     cache: CacheService = Depends(get_cache),
-) -> QuizResponse:
+) -> QuizCreateResponse:
     """Create a new quiz with AI-generated questions."""
     
     ai_provider = get_ai_provider()
@@ -75,22 +84,13 @@ async def create_quiz(
         await db.flush()  # Get quiz ID
         
         # Create questions
-        for index, question_data in enumerate(questions_data):
-            # Transform AI provider data to match our database schema
-            question = Question(
-                quiz_id=quiz.id,
-                question_text=question_data.get("question", question_data.get("question_text", "")),
-                question_type=question_data.get("type", question_data.get("question_type", "MCQ")),
-                difficulty=question_data.get("difficulty", quiz_data.difficulty),
-                topic=question_data.get("topic", quiz_data.topics[0] if quiz_data.topics else quiz_data.subject),
-                order=question_data.get("order", index + 1),
-                points=question_data.get("points", 1.0),
-                options=question_data.get("options"),
-                correct_answer=question_data.get("correct_answer"),
-                explanation=question_data.get("explanation"),
-                hint_text=question_data.get("hint_text"),
-            )
-            db.add(question)
+        questions = build_questions(
+            quiz.id,
+            questions_data,
+            default_difficulty=quiz_data.difficulty,
+            default_topic=quiz_data.topics[0] if quiz_data.topics else quiz_data.subject,
+        )
+        db.add_all(questions)
         
         await db.commit()
         await db.refresh(quiz)
@@ -103,9 +103,19 @@ async def create_quiz(
             ttl=3600
         )
         
+        # Return the questions too, and warm the questions cache for later GETs
+        questions_response = [
+            QuestionResponse.model_validate(q) for q in sorted(questions, key=lambda q: q.order)
+        ]
+        await cache.set(
+            cache.get_quiz_questions_cache_key(quiz.id),
+            [q.model_dump() for q in questions_response],
+            ttl=3600
+        )
+        
         logger.info("Quiz created", quiz_id=quiz.id, num_questions=len(questions_data))
         
-        return quiz_response
+        return QuizCreateResponse(**quiz_response.model_dump(), questions=questions_response)
     
     except Exception as e:
         logger.error("Failed to create quiz", error=str(e), traceback=str(e.__traceback__))
@@ -246,41 +256,12 @@ async def submit_quiz(
         answers=answers,
     )
     
-    # Update submission with scores
-    submission.total_score = evaluation_data["total_score"]
-    submission.max_possible_score = evaluation_data["max_possible_score"]
-    submission.percentage = evaluation_data["percentage"]
-    
-    # Update individual answers with grades
-    for answer, graded_answer in zip(answers, evaluation_data["answers"]):
-        answer.is_correct = graded_answer["is_correct"]
-        answer.points_earned = graded_answer["points_earned"]
-        answer.max_points = graded_answer["max_points"]
-        answer.ai_feedback = graded_answer["ai_feedback"]
-        answer.confidence_score = graded_answer["confidence_score"]
-    
-    # Create evaluation record
-    evaluation = Evaluation(
-        submission_id=submission.id,
-        total_score=evaluation_data["total_score"],
-        max_possible_score=evaluation_data["max_possible_score"],
-        percentage=evaluation_data["percentage"],
-        correct_answers=evaluation_data["correct_answers"],
-        total_questions=evaluation_data["total_questions"],
-        mcq_score=evaluation_data["mcq_score"],
-        tf_score=evaluation_data["tf_score"],
-        short_answer_score=evaluation_data["short_answer_score"],
-        easy_score=evaluation_data["easy_score"],
-        medium_score=evaluation_data["medium_score"],
-        hard_score=evaluation_data["hard_score"],
-        topic_scores=evaluation_data["topic_scores"],
-        strengths=evaluation_data["strengths"],
-        weaknesses=evaluation_data["weaknesses"],
-        suggestions=evaluation_data["suggestions"],
-        performance_level=evaluation_data["performance_level"],
-    )
+    try:
+        _suggestions_adapter.validate_python(evaluation_data["suggestions"])
+    except PydanticValidationError as e:
+        raise AIServiceError("AI provider returned invalid improvement suggestions") from e
     
-    db.add(evaluation)
+    record_evaluation(db, submission, answers, evaluation_data)
     await db.commit()
     
     # Update leaderboard
@@ -340,7 +321,66 @@ async def submit_quiz(
     evaluation_data["notification_sent"] = notification_sent
     evaluation_data["notification_to_email"] = notification_to_email
 
-    return SubmissionEvaluation.model_validate(evaluation_data)
+    # Every value was just produced by the grading service, so build the
+    # response without validating it again
+    evaluation_data["answers"] = [
+        AnswerEvaluation.model_construct(**answer) for answer in evaluation_data["answers"]
+    ]
+    return SubmissionEvaluation.model_construct(**evaluation_data)
+
+
+@router.get("/{quiz_id}/submissions/{submission_id}", response_model=SubmissionEvaluation)
+async def get_submission_evaluation(
+    quiz_id: int,
+    submission_id: int,
+    current_user: AuthUser,
+    db: DBSession,
+) -> SubmissionEvaluation:
+    """Get the stored evaluation of one of the current user's submissions."""
+    
+    submission_query = (
+        select(Submission)
+        .options(selectinload(Submission.answers), selectinload(Submission.evaluation))
+        .where(
+            Submission.id == submission_id,
+            Submission.quiz_id == quiz_id,
+            Submission.user_id == current_user.id,
+        )
+    )
+    submission_result = await db.execute(submission_query)
+    submission = submission_result.scalar_one_or_none()
+    
+    if not submission or not submission.evaluation:
+        raise NotFoundError("Submission not found")
+    
+    evaluation = submission.evaluation
+    return SubmissionEvaluation(
+        submission_id=submission.id,
+        quiz_id=submission.quiz_id,
+        total_score=evaluation.total_score,
+        max_possible_score=evaluation.max_possible_score,
+        percentage=evaluation.percentage,
+        correct_answers=evaluation.correct_answers,
+        total_questions=evaluation.total_questions,
+        performance_level=evaluation.performance_level,
+        answers=[
+            AnswerEvaluation.model_validate(answer)
+            for answer in sorted(submission.answers, key=lambda a: a.id)
+        ],
+        mcq_score=evaluation.mcq_score,
+        tf_score=evaluation.tf_score,
+        short_answer_score=evaluation.short_answer_score,
+        easy_score=evaluation.easy_score,
+        medium_score=evaluation.medium_score,
+        hard_score=evaluation.hard_score,
+        topic_scores=evaluation.topic_scores,
+        suggestions=evaluation.suggestions,
+        strengths=evaluation.strengths,
+        weaknesses=evaluation.weaknesses,
+        overall_feedback=evaluation.overall_feedback,
+        time_taken_minutes=submission.time_taken_minutes,
+        submitted_at=submission.submitted_at,
+    )
 
 
 @router.post("/{quiz_id}/retry", response_model=QuizRetryResponse)
@@ -42,6 +42,9 @@ class Settings(BaseSettings):
     hint_rate_limit_per_user_question: int = Field(
         default=3, env="HINT_RATE_LIMIT_PER_USER_QUESTION"
     )
+    hint_refill_per_second: float = Field(
+        default=0.0, ge=0, env="HINT_REFILL_PER_SECOND"
+    )  # 0 = hints never come back, a fixed cap per question
     submission_rate_limit_per_quiz: int = Field(
         default=10, env="SUBMISSION_RATE_LIMIT_PER_QUIZ"
     )
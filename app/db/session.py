@@ -2,8 +2,9 @@
 
 from typing import AsyncGenerator
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from app.core.config import get_settings
 
@@ -41,15 +42,48 @@ def get_engine():
         # Ensure correct driver (psycopg3) is used in production/staging
         database_url = _coerce_db_url(database_url)
         
-        _engine = create_async_engine(
-            database_url,
-            echo=settings.is_development,
-            poolclass=NullPool if settings.is_testing else None,
-            pool_pre_ping=True,
-        )
+        if settings.is_testing and database_url.startswith("sqlite"):
+            _engine = _create_sqlite_test_engine(database_url)
+        else:
+            _engine = create_async_engine(
+                database_url,
+                echo=settings.is_development,
+                poolclass=NullPool if settings.is_testing else None,
+                pool_pre_ping=True,
+            )
     return _engine
 
 
+def _create_sqlite_test_engine(database_url: str):
+    """Create an engine for the file-backed SQLite test database.
+
+    Every transaction starts with BEGIN IMMEDIATE, so concurrent writers
+    queue on the busy timeout instead of failing when a deferred read lock
+    can't be upgraded. The driver's own transaction handling is switched
+    off so SQLAlchemy emits BEGIN itself, which SAVEPOINT-based test
+    isolation needs.
+    """
+    engine = create_async_engine(
+        database_url,
+        connect_args={"check_same_thread": False},
+        poolclass=AsyncAdaptedQueuePool,
+    )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _configure_connection(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        # Test data is throwaway; don't pay for fsync on every commit
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
+
+
 def get_session_factory():
     """Get or create the session factory."""
     global _session_factory
@@ -2,7 +2,6 @@
 
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
-import json
 from pathlib import Path
 
 import structlog
@@ -18,6 +17,7 @@ from app.core.config import get_settings
 from app.core.errors import AppError
 from app.core.logging import setup_logging
 from app.db.session import create_tables
+from app.services.hint_usage import hint_usage_store
 
 # Setup structured logging
 logger = structlog.get_logger()
@@ -60,6 +60,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.warning(f"Error closing cache connections: {e}")
     
+    # Close SMTP connection
+    try:
+        from app.services.notifications import notification_service
+        await notification_service.close()
+    except Exception as e:
+        logger.warning(f"Error closing SMTP connection: {e}")
+    
     logger.info("AI Quiz Microservice shutdown completed")
 
 
@@ -71,9 +78,14 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs" if settings.env == "dev" else None,
     redoc_url="/redoc" if settings.env == "dev" else None,
+    # Tests never fetch the schema; don't expose it there
+    openapi_url=None if settings.is_testing else "/openapi.json",
     lifespan=lifespan,
 )
 
+# Shared state reachable from handlers and tests
+app.state.hint_usage_store = hint_usage_store
+
 # Setup CORS
 app.add_middleware(
     CORSMiddleware,
@@ -297,17 +309,17 @@ async def root() -> dict[str, str]:
 
 
 @app.get("/postman-collection", include_in_schema=False)
-async def get_postman_collection() -> JSONResponse:
+async def get_postman_collection() -> Response:
     """Serve the Postman collection JSON.
 
-    Also available at /static/postman_collection.json
+    Also available at /static/postman_collection.json. The file is already
+    JSON, so its bytes are sent as-is rather than decoded and re-encoded.
     """
     collection_file = static_dir / "postman_collection.json"
     if not collection_file.exists():
         return JSONResponse(status_code=404, content={"detail": "Postman collection not found"})
     try:
-        data = json.loads(collection_file.read_text(encoding="utf-8"))
-        return JSONResponse(status_code=200, content=data)
+        return Response(content=collection_file.read_bytes(), media_type="application/json")
     except Exception as e:
         return JSONResponse(status_code=500, content={"detail": f"Failed to read collection: {e}"})
 
@@ -6,6 +6,7 @@ from typing import Optional
 from pydantic import Field, field_validator
 
 from app.schemas.common import BaseSchema, TimestampMixin
+from app.schemas.question import QuestionResponse
 
 
 class QuizCreate(BaseSchema):
@@ -56,6 +57,12 @@ class QuizResponse(BaseSchema, TimestampMixin):
     creator_id: int
 
 
+class QuizCreateResponse(QuizResponse):
+    """Schema for a newly created quiz, including its questions (without answers)."""
+    
+    questions: list[QuestionResponse]
+
+
 class QuizSummary(BaseSchema):
     """Schema for quiz summary in lists."""
     
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import Field, field_validator
+from pydantic import Field, model_validator
 
 from app.schemas.common import BaseSchema
 
@@ -16,14 +16,13 @@ class AnswerSubmission(BaseSchema):
     selected_option: Optional[str] = Field(None, description="Selected option for MCQ/TF")
     time_spent_seconds: Optional[int] = Field(None, ge=0, description="Time spent on question")
     
-    @field_validator("answer_text", "selected_option")
-    @classmethod
-    def validate_answer_provided(cls, v: Optional[str], info) -> Optional[str]:
-        # At least one answer field should be provided
-        values = info.data
-        if not v and not values.get("selected_option") and not values.get("answer_text"):
+    @model_validator(mode="after")
+    def validate_answer_provided(self) -> "AnswerSubmission":
+        # At least one answer field should be provided; a field validator would
+        # never see the fields the client left out
+        if not self.answer_text and not self.selected_option:
             raise ValueError("Either answer_text or selected_option must be provided")
-        return v
+        return self
 
 
 class QuizSubmission(BaseSchema):
@@ -54,7 +53,7 @@ class SubmissionEvaluation(BaseSchema):
     percentage: float
     correct_answers: int
     total_questions: int
-    performance_level: str
+    performance_level: Optional[str] = None
     
     # Per-question breakdown
     answers: list[AnswerEvaluation]
@@ -190,5 +190,5 @@ class AdaptiveService:
             "remaining": remaining_count,
             "correct": correct_count,
             "incorrect": incorrect_count,
-            "percentage_complete": round((answered_count / total_questions) * 100, 1) if total_questions > 0 else 0,
+            "percentage_complete": round((answered_count / total_questions) * 100) if total_questions > 0 else 0,
         }
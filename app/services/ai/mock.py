@@ -1,8 +1,10 @@
 """Mock AI provider for testing and development."""
 
+import copy
 import hashlib
 import random
-from typing import Any
+from collections import OrderedDict
+from typing import Any, ClassVar
 
 from app.services.ai.provider import AIProvider
 
@@ -10,6 +12,11 @@ from app.services.ai.provider import AIProvider
 class MockProvider(AIProvider):
     """Mock AI provider that returns deterministic fake content."""
     
+    # Output depends only on the request, so generated sets are shared across
+    # instances; keep only the most recently used ones
+    _question_cache: ClassVar[OrderedDict[tuple[Any, ...], list[dict[str, Any]]]] = OrderedDict()
+    _question_cache_size: ClassVar[int] = 32
+    
     def __init__(self, seed: int = 42):
         """Initialize with a seed for deterministic results."""
         self.seed = seed
@@ -33,6 +40,34 @@ class MockProvider(AIProvider):
         standard: str | None = None,
     ) -> list[dict[str, Any]]:
         """Generate mock quiz questions."""
+        cache_key = (
+            subject, grade_level, num_questions, difficulty,
+            tuple(topics), tuple(question_types), standard,
+        )
+        cached = self._question_cache.get(cache_key)
+        if cached is None:
+            cached = self._build_questions(
+                subject, grade_level, num_questions, difficulty, topics, question_types
+            )
+            self._question_cache[cache_key] = cached
+            if len(self._question_cache) > self._question_cache_size:
+                self._question_cache.popitem(last=False)
+        else:
+            self._question_cache.move_to_end(cache_key)
+        
+        # Callers mutate the returned dicts; never hand out the cached ones
+        return copy.deepcopy(cached)
+    
+    def _build_questions(
+        self,
+        subject: str,
+        grade_level: str,
+        num_questions: int,
+        difficulty: str,
+        topics: list[str],
+        question_types: list[str],
+    ) -> list[dict[str, Any]]:
+        """Build the deterministic question set for a request."""
         # Create deterministic seed from parameters
         seed_string = f"{subject}_{grade_level}_{num_questions}_{difficulty}_{'_'.join(topics)}"
         rng = self._get_seeded_random(seed_string)
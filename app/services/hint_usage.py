@@ -0,0 +1,71 @@
+"""Hint usage tracking for per-user, per-question rate limits."""
+
+import threading
+import time
+from typing import Optional
+
+from app.core.config import get_settings
+
+# Buckets are spread over a fixed set of locks so unrelated keys don't contend
+_LOCK_SHARDS = 16
+
+
+class HintUsageStore:
+    """In-memory token buckets per (user, question) (in production, use Redis or database).
+    
+    Each bucket starts with ``limit`` tokens and regains ``refill_per_second``
+    of them over time. With the default refill of 0 the limit is a fixed cap.
+    """
+    
+    def __init__(self, refill_per_second: Optional[float] = None) -> None:
+        if refill_per_second is None:
+            refill_per_second = get_settings().hint_refill_per_second
+        self.refill_per_second = refill_per_second
+        # (user_id, question_id) -> [tokens, last_refill, capacity]
+        self._buckets: dict[tuple[int, int], list[float]] = {}
+        self._locks = [threading.Lock() for _ in range(_LOCK_SHARDS)]
+    
+    def _lock_for(self, key: tuple[int, int]) -> threading.Lock:
+        """Lock guarding the shard that holds ``key``."""
+        return self._locks[hash(key) % _LOCK_SHARDS]
+    
+    def _refill(self, bucket: list[float], now: float) -> None:
+        """Credit tokens earned since the bucket was last touched."""
+        tokens, last_refill, capacity = bucket
+        bucket[0] = min(capacity, tokens + (now - last_refill) * self.refill_per_second)
+        bucket[1] = now
+    
+    def reserve(self, user_id: int, question_id: int, limit: int) -> Optional[int]:
+        """Take one token if available.
+        
+        Returns the number of hints currently counted against the user for this
+        question, or None when the bucket is empty.
+        """
+        key = (user_id, question_id)
+        now = time.monotonic()
+        with self._lock_for(key):
+            bucket = self._buckets.setdefault(key, [float(limit), now, float(limit)])
+            self._refill(bucket, now)
+            if bucket[0] < 1:
+                return None
+            
+            bucket[0] -= 1
+            return int(bucket[2] - bucket[0])
+    
+    def release(self, user_id: int, question_id: int) -> None:
+        """Give back a token reserved by a request that failed."""
+        key = (user_id, question_id)
+        with self._lock_for(key):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket[0] = min(bucket[2], bucket[0] + 1)
+    
+    def reset(self, user_id: int, question_id: int) -> None:
+        """Forget a user's hint usage for a question."""
+        key = (user_id, question_id)
+        with self._lock_for(key):
+            self._buckets.pop(key, None)
+
+
+# Global hint usage store instance
+hint_usage_store = HintUsageStore()
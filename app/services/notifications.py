@@ -14,6 +14,9 @@ from app.core.config import get_settings
 
 logger = structlog.get_logger()
 
+# Keep a dead or unreachable SMTP server from stalling startup or a send
+SMTP_TIMEOUT_SECONDS = 10
+
 
 class EmailNotification(BaseModel):
     """Email notification model."""
@@ -29,6 +32,43 @@ class NotificationService:
     
     def __init__(self) -> None:
         self.settings = get_settings()
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._open_lock = asyncio.Lock()
+    
+    async def open(self) -> None:
+        """Open a persistent SMTP connection reused by subsequent sends.
+        
+        Saves the TCP + STARTTLS handshake and login on every email. Called
+        lazily by the first send, and again after a connection is dropped.
+        """
+        async with self._open_lock:
+            if self._smtp is not None and self._smtp.is_connected:
+                return
+            
+            smtp = aiosmtplib.SMTP(
+                hostname=self.settings.smtp_host,
+                port=self.settings.smtp_port,
+                start_tls=self.settings.smtp_use_tls,
+                username=self.settings.smtp_username or None,
+                password=self.settings.smtp_password or None,
+                timeout=SMTP_TIMEOUT_SECONDS,
+            )
+            await smtp.connect()
+            self._smtp = smtp
+            logger.info("SMTP connection opened", host=self.settings.smtp_host)
+    
+    async def close(self) -> None:
+        """Close the persistent SMTP connection if one is open."""
+        if self._smtp is None:
+            return
+        
+        try:
+            if self._smtp.is_connected:
+                await self._smtp.quit()
+        except aiosmtplib.SMTPException as e:
+            logger.warning("Error closing SMTP connection", error=str(e))
+        finally:
+            self._smtp = None
         
     async def send_quiz_result_email(
         self, 
@@ -127,7 +167,19 @@ class NotificationService:
         msg.attach(text_part)
         msg.attach(html_part)
         
-        # Send email
+        # Send over the persistent connection, (re)opening it as needed
+        try:
+            await self.open()
+            await self._smtp.send_message(msg)
+            return
+        except (aiosmtplib.SMTPException, OSError) as e:
+            # The server may have dropped an idle session; the next send reopens it
+            logger.warning("Persistent SMTP connection failed, resending", error=str(e))
+            if self._smtp is not None:
+                self._smtp.close()
+                self._smtp = None
+        
+        # Fall back to a one-shot connection
         await aiosmtplib.send(
             msg,
             hostname=self.settings.smtp_host,
@@ -135,6 +187,7 @@ class NotificationService:
             start_tls=self.settings.smtp_use_tls,
             username=self.settings.smtp_username,
             password=self.settings.smtp_password,
+            timeout=SMTP_TIMEOUT_SECONDS,
         )
     
     def _render_quiz_result_template(self, data: Dict[str, Any]) -> str:
@@ -0,0 +1,81 @@
+"""Builders for the quiz records shared by the endpoints and test seeding."""
+
+from typing import Any, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.answer import Answer
+from app.models.evaluation import Evaluation
+from app.models.question import Question
+from app.models.submission import Submission
+
+
+def build_questions(
+    quiz_id: int,
+    questions_data: List[Dict[str, Any]],
+    default_difficulty: str,
+    default_topic: str,
+) -> List[Question]:
+    """Turn AI provider question dicts into Question rows for a quiz."""
+    questions = []
+    for index, question_data in enumerate(questions_data):
+        # Transform AI provider data to match our database schema
+        questions.append(Question(
+            quiz_id=quiz_id,
+            question_text=question_data.get("question", question_data.get("question_text", "")),
+            question_type=question_data.get("type", question_data.get("question_type", "MCQ")),
+            difficulty=question_data.get("difficulty", default_difficulty),
+            topic=question_data.get("topic", default_topic),
+            order=question_data.get("order", index + 1),
+            points=question_data.get("points", 1.0),
+            options=question_data.get("options"),
+            correct_answer=question_data.get("correct_answer"),
+            explanation=question_data.get("explanation"),
+            hint_text=question_data.get("hint_text"),
+        ))
+    return questions
+
+
+def record_evaluation(
+    db: AsyncSession,
+    submission: Submission,
+    answers: List[Answer],
+    evaluation_data: Dict[str, Any],
+) -> Evaluation:
+    """Store grading results on a submission and its answers and add its Evaluation."""
+    
+    # Update submission with scores
+    submission.total_score = evaluation_data["total_score"]
+    submission.max_possible_score = evaluation_data["max_possible_score"]
+    submission.percentage = evaluation_data["percentage"]
+    
+    # Update individual answers with grades
+    for answer, graded_answer in zip(answers, evaluation_data["answers"]):
+        answer.is_correct = graded_answer["is_correct"]
+        answer.points_earned = graded_answer["points_earned"]
+        answer.max_points = graded_answer["max_points"]
+        answer.ai_feedback = graded_answer["ai_feedback"]
+        answer.confidence_score = graded_answer["confidence_score"]
+    
+    # Create evaluation record
+    evaluation = Evaluation(
+        submission_id=submission.id,
+        total_score=evaluation_data["total_score"],
+        max_possible_score=evaluation_data["max_possible_score"],
+        percentage=evaluation_data["percentage"],
+        correct_answers=evaluation_data["correct_answers"],
+        total_questions=evaluation_data["total_questions"],
+        mcq_score=evaluation_data["mcq_score"],
+        tf_score=evaluation_data["tf_score"],
+        short_answer_score=evaluation_data["short_answer_score"],
+        easy_score=evaluation_data["easy_score"],
+        medium_score=evaluation_data["medium_score"],
+        hard_score=evaluation_data["hard_score"],
+        topic_scores=evaluation_data["topic_scores"],
+        strengths=evaluation_data["strengths"],
+        weaknesses=evaluation_data["weaknesses"],
+        suggestions=evaluation_data["suggestions"],
+        performance_level=evaluation_data["performance_level"],
+    )
+    db.add(evaluation)
+    return evaluation
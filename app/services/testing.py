@@ -0,0 +1,93 @@
+"""Service-layer helpers for seeding test data without going through HTTP."""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.answer import Answer
+from app.models.quiz import Quiz
+from app.models.submission import Submission
+from app.services.ai.provider import get_ai_provider
+from app.services.datetime import get_utc_now
+from app.services.grading import GradingService
+from app.services.quiz_records import build_questions, record_evaluation
+
+
+async def seed_submission(
+    db: AsyncSession,
+    user_id: int,
+    subject: str,
+    grade_level: str,
+    score_range: str = "good",
+) -> int:
+    """Create a quiz, answer and grade it in ``db``, and return the quiz id.
+    
+    Does what POST /quizzes, GET /quizzes/{id}/questions and
+    POST /quizzes/{id}/submit do together, minus caching, leaderboard and
+    notifications. ``score_range="good"`` picks each question's first option,
+    anything else the last. Only flushes; the caller owns the transaction.
+    """
+    
+    questions_data = await get_ai_provider().generate_questions(
+        subject=subject,
+        grade_level=grade_level,
+        num_questions=2,
+        difficulty="easy",
+        topics=["test_topic"],
+        question_types=["MCQ"],
+    )
+    
+    quiz = Quiz(
+        title=f"{subject} - {grade_level} Quiz",
+        subject=subject,
+        grade_level=grade_level,
+        num_questions=len(questions_data),
+        difficulty="easy",
+        topics=["test_topic"],
+        question_types=["MCQ"],
+        creator_id=user_id,
+        is_published=True,
+    )
+    db.add(quiz)
+    await db.flush()
+    
+    questions = build_questions(
+        quiz.id, questions_data, default_difficulty="easy", default_topic="test_topic"
+    )
+    db.add_all(questions)
+    
+    now = get_utc_now()
+    submission = Submission(
+        user_id=user_id,
+        quiz_id=quiz.id,
+        started_at=now,
+        is_completed=True,
+        submitted_at=now,
+    )
+    db.add(submission)
+    await db.flush()
+    
+    answers = []
+    for question in questions:
+        if question.options:
+            selected = question.options[0] if score_range == "good" else question.options[-1]
+        else:
+            selected = "True" if score_range == "good" else "False"
+        answer = Answer(
+            submission_id=submission.id,
+            question_id=question.id,
+            selected_option=selected,
+        )
+        answers.append(answer)
+        db.add(answer)
+    
+    await db.flush()
+    
+    evaluation_data = await GradingService().grade_submission(
+        submission=submission,
+        questions=questions,
+        answers=answers,
+    )
+    
+    record_evaluation(db, submission, answers, evaluation_data)
+    await db.flush()
+    
+    return quiz.id
@@ -22,21 +22,32 @@ def wait_for_database():
     max_retries = 30
     retry_count = 0
     
+    # Import here to avoid issues if modules aren't available yet
+    import psycopg
+    from sqlalchemy.engine import make_url
+    from app.core.config import get_settings
+    from app.db.session import _coerce_db_url
+    
+    settings = get_settings()
+    # Normalize the URL like the app does, then drop SQLAlchemy's "+driver"
+    # suffix, which libpq doesn't understand
+    dsn = make_url(_coerce_db_url(settings.database_url)).set(
+        drivername="postgresql"
+    ).render_as_string(hide_password=False)
+    
     while retry_count < max_retries:
         try:
-            # Import here to avoid issues if modules aren't available yet
-            import psycopg
-            from app.core.config import get_settings
-            
-            settings = get_settings()
-            
             # Test database connection
-            conn = psycopg.connect(settings.database_url)
+            conn = psycopg.connect(dsn)
             conn.close()
             logger.info("Database connection successful!")
             return True
             
-        except Exception as e:
+        except (psycopg.OperationalError, OSError) as e:
+            # Retrying won't fix bad credentials
+            if getattr(e, "sqlstate", None) == "28P01":
+                logger.error(f"Database authentication failed: {e}")
+                return False
             retry_count += 1
             logger.info(f"Database connection attempt {retry_count}/{max_retries} failed: {e}")
             time.sleep(2)
@@ -49,23 +60,30 @@ def run_migrations():
     logger.info("Running database migrations...")
     
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             ["alembic", "upgrade", "head"],
-            capture_output=True,
-            text=True,
-            check=True
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
         )
-        logger.info("Database migrations completed successfully")
-        logger.debug(f"Migration output: {result.stdout}")
-        return True
-        
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Migration failed: {e}")
-        logger.error(f"Migration error output: {e.stderr}")
-        return False
+        stdout, stderr = proc.communicate(timeout=120)
     except FileNotFoundError:
         logger.error("Alembic not found. Make sure it's installed.")
         return False
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        logger.error("Migration timed out after 120 seconds")
+        return False
+    
+    if proc.returncode != 0:
+        logger.error(f"Migration failed with exit code {proc.returncode}")
+        logger.error(f"Migration error output: {stderr}")
+        return False
+    
+    logger.info("Database migrations completed successfully")
+    logger.debug(f"Migration output: {stdout}")
+    return True
 
 def start_application():
     """Start the FastAPI application."""
@@ -74,20 +92,18 @@ def start_application():
     # Get port from environment or default to 8000
     port = os.getenv("PORT", "8000")
     
-    # Start uvicorn
+    # Replace this process with uvicorn so signals go straight to the server
     try:
-        subprocess.run([
+        os.execvp("uvicorn", [
             "uvicorn",
             "app.main:app",
             "--host", "0.0.0.0",
             "--port", port,
             "--workers", "1"
-        ], check=True)
-    except subprocess.CalledProcessError as e:
+        ])
+    except OSError as e:
         logger.error(f"Failed to start application: {e}")
         sys.exit(1)
-    except KeyboardInterrupt:
-        logger.info("Application stopped by user")
 
 def main():
     """Main startup function."""
@@ -0,0 +1,188 @@
+"""Shared test fixtures."""
+
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+# Run against a throwaway SQLite file unless told otherwise. Each pytest-xdist
+# worker is its own process, and the pid keeps concurrent runs on one host
+# (two checkouts, CI next to a local run) from sharing or deleting a file
+_worker_id = os.environ.get("PYTEST_XDIST_WORKER", "main")
+_test_db_path = Path(tempfile.gettempdir()) / f"quiz_test_{os.getpid()}_{_worker_id}.db"
+os.environ.setdefault("ENV", "test")
+os.environ.setdefault("DATABASE_URL_TEST", f"sqlite+aiosqlite:///{_test_db_path}")
+os.environ.setdefault("CACHE_ENABLED", "false")
+
+import pytest
+from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import create_access_token, verify_token
+from app.db.session import create_tables, get_db_session, get_engine, get_session_factory
+from app.models.question import Question
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create the schema once in a fresh database file, removed after the session."""
+    _test_db_path.unlink(missing_ok=True)
+    asyncio.run(create_tables())
+    yield
+    _test_db_path.unlink(missing_ok=True)
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The FastAPI application, imported on first use so collection doesn't build it."""
+    from app.main import app
+    
+    return app
+
+
+@pytest.fixture
+def db_txn(app):
+    """Roll back everything the app writes during a test.
+    
+    Request sessions are bound to one connection inside an outer transaction;
+    their commits only release SAVEPOINTs, and the outer transaction is rolled
+    back afterwards. Meant for tests that drive the app sequentially. Yields
+    ``run(work)``, which runs ``work(session)`` inside the same transaction.
+    """
+    loop = asyncio.new_event_loop()
+    conn = loop.run_until_complete(get_engine().connect())
+    trans = loop.run_until_complete(conn.begin())
+    
+    def _session_factory():
+        return AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+    
+    async def _session():
+        async with _session_factory() as session:
+            yield session
+    
+    def _run(work):
+        async def _with_session():
+            async with _session_factory() as session:
+                result = await work(session)
+                await session.commit()
+                return result
+        
+        return loop.run_until_complete(_with_session())
+    
+    app.dependency_overrides[get_db_session] = _session
+    try:
+        yield _run
+    finally:
+        app.dependency_overrides.pop(get_db_session, None)
+        loop.run_until_complete(trans.rollback())
+        loop.run_until_complete(conn.close())
+        loop.close()
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Synchronous test client; the app lifespan runs once for the whole session."""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def valid_token(client):
+    """Access token from a single login, reused across the session."""
+    response = client.post("/auth/login", json={
+        "username": "testuser",
+        "password": "testpass"
+    })
+    return response.json()["access_token"]
+
+
+@pytest.fixture(scope="session")
+def issued_token():
+    """Access token signed directly with the claims /auth/login issues in test mode.
+    
+    Tests that aren't about authentication use this to skip the login round-trip.
+    """
+    return create_access_token({"sub": "1", "username": "testuser"})
+
+
+@pytest.fixture(scope="session")
+def test_user_id(issued_token):
+    """User id the shared token was issued for."""
+    return int(verify_token(issued_token)["sub"])
+
+
+@pytest.fixture(scope="session")
+def auth_headers(issued_token):
+    """Authorization headers for the shared test user."""
+    return {"Authorization": f"Bearer {issued_token}"}
+
+
+@pytest.fixture(scope="module")
+def sample_quiz(client, auth_headers, first_question_id):
+    """Quiz created once per module; returns ``(quiz_id, first_question_id)``."""
+    quiz_data = {
+        "subject": "Mathematics",
+        "grade_level": "8",
+        "num_questions": 3,
+        "difficulty": "medium",
+        "topics": ["algebra"],
+        "question_types": ["MCQ"]
+    }
+    
+    response = client.post("/quizzes", json=quiz_data, headers=auth_headers)
+    quiz_id = response.json()["id"]
+    return quiz_id, first_question_id(quiz_id)
+
+
+@pytest.fixture
+async def async_client(app):
+    """Async HTTP client dispatching directly to the ASGI app."""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture(scope="session")
+def run_db():
+    """Run ``work(session)`` against the app database and return its result.
+
+    Uses a private event loop so synchronous, module-scoped fixtures can seed
+    rows directly instead of going through HTTP and question generation.
+    """
+
+    def _run(work):
+        async def _with_session():
+            async with get_session_factory()() as session:
+                return await work(session)
+
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(_with_session())
+        finally:
+            loop.close()
+
+    return _run
+
+
+@pytest.fixture(scope="session")
+def first_question_id(run_db):
+    """Look up a quiz's first question id in the database, skipping an HTTP round-trip."""
+    
+    def _lookup(quiz_id):
+        async def query(session):
+            return await session.scalar(
+                select(Question.id)
+                .where(Question.quiz_id == quiz_id)
+                .order_by(Question.order)
+                .limit(1)
+            )
+        
+        return run_db(query)
+    
+    return _lookup
@@ -1,27 +1,15 @@
 """Adaptive policy tests."""
 
-import pytest
-from fastapi.testclient import TestClient
-
-from app.main import app
-
-client = TestClient(app)
+import asyncio
 
+import pytest
 
-def get_auth_headers():
-    """Helper to get authentication headers."""
-    login_response = client.post("/auth/login", json={
-        "username": "testuser",
-        "password": "testpass"
-    })
-    token = login_response.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
+from app.models.question import Question
+from app.models.quiz import Quiz
 
 
-def create_adaptive_quiz():
-    """Helper to create an adaptive quiz."""
-    headers = get_auth_headers()
-    
+async def create_adaptive_quiz(async_client, headers):
+    """Helper to create an adaptive quiz and return its id."""
     quiz_data = {
         "subject": "Mathematics",
         "grade_level": "8",
@@ -32,17 +20,56 @@ def create_adaptive_quiz():
         "adaptive": True
     }
     
-    response = client.post("/quizzes", json=quiz_data, headers=headers)
+    response = await async_client.post("/quizzes", json=quiz_data, headers=headers)
     assert response.status_code == 200
     return response.json()["id"]
 
 
-def test_adaptive_quiz_next_question_start():
+@pytest.fixture(scope="module")
+def seeded_adaptive_quiz(run_db, test_user_id):
+    """Adaptive quiz inserted directly into the database, shared by read-only tests."""
+    
+    async def seed(session):
+        quiz = Quiz(
+            title="Mathematics - 8 Quiz",
+            subject="Mathematics",
+            grade_level="8",
+            num_questions=6,
+            difficulty="adaptive",
+            adaptive=True,
+            topics=["algebra", "geometry"],
+            question_types=["MCQ"],
+            creator_id=test_user_id,
+            is_published=True,
+        )
+        session.add(quiz)
+        await session.flush()
+        
+        # Two questions per difficulty so the policy has somewhere to step to
+        for order, difficulty in enumerate(("easy", "medium", "hard") * 2, start=1):
+            session.add(Question(
+                quiz_id=quiz.id,
+                question_text=f"Question {order}: What is the main concept of algebra? (Difficulty: {difficulty})",
+                question_type="MCQ",
+                difficulty=difficulty,
+                topic="algebra",
+                order=order,
+                points=1,
+                options=["Option A", "Option B", "Option C", "Option D"],
+                correct_answer="Option A",
+            ))
+        
+        await session.commit()
+        return quiz.id
+    
+    return run_db(seed)
+
+
+async def test_adaptive_quiz_next_question_start(async_client, auth_headers, seeded_adaptive_quiz):
     """Test getting the first question in adaptive mode."""
-    headers = get_auth_headers()
-    quiz_id = create_adaptive_quiz()
+    quiz_id = seeded_adaptive_quiz
     
-    response = client.post(f"/quizzes/{quiz_id}/next", json={}, headers=headers)
+    response = await async_client.post(f"/quizzes/{quiz_id}/next", json={}, headers=auth_headers)
     assert response.status_code == 200
     
     data = response.json()
@@ -61,63 +88,31 @@ def test_adaptive_quiz_next_question_start():
     assert progress["answered"] == 0  # No questions answered yet
 
 
-def test_adaptive_quiz_step_up_difficulty():
-    """Test adaptive difficulty stepping up with good performance."""
-    headers = get_auth_headers()
-    quiz_id = create_adaptive_quiz()
-    
-    # Get questions to simulate answering
-    questions_response = client.get(f"/quizzes/{quiz_id}/questions", headers=headers)
-    questions = questions_response.json()
-    
-    # Simulate good performance by "answering" questions correctly
-    # Note: This test validates the policy logic, actual submission would be via submit endpoint
+@pytest.mark.parametrize("_scenario", ["step_up", "step_down", "hold"])
+async def test_adaptive_first_question(_scenario, async_client, auth_headers, seeded_adaptive_quiz):
+    """Test the first adaptive question for each difficulty-policy scenario.
     
-    # Start adaptive session
-    response = client.post(f"/quizzes/{quiz_id}/next", json={}, headers=headers)
-    assert response.status_code == 200
-    
-    first_question = response.json()["question"]
-    assert first_question["difficulty"] in ["easy", "medium"]  # Should start appropriately
-
-
-def test_adaptive_quiz_step_down_difficulty():
-    """Test adaptive difficulty stepping down with poor performance."""
-    headers = get_auth_headers()
-    quiz_id = create_adaptive_quiz()
+    The policy itself is covered by test_adaptive_performance_boundaries;
+    this only checks the endpoint hands out a sensible starting question.
+    """
+    quiz_id = seeded_adaptive_quiz
     
     # Start adaptive session
-    response = client.post(f"/quizzes/{quiz_id}/next", json={}, headers=headers)
+    response = await async_client.post(f"/quizzes/{quiz_id}/next", json={}, headers=auth_headers)
     assert response.status_code == 200
     
-    # The adaptive logic is tested through the service layer
-    # This test ensures the endpoint works correctly
     data = response.json()
     assert data["question"] is not None
     assert data["is_complete"] == False
-
-
-def test_adaptive_quiz_hold_difficulty():
-    """Test adaptive difficulty holding current level with average performance."""
-    headers = get_auth_headers()
-    quiz_id = create_adaptive_quiz()
-    
-    # Start adaptive session
-    response = client.post(f"/quizzes/{quiz_id}/next", json={}, headers=headers)
-    assert response.status_code == 200
-    
-    # Verify basic adaptive functionality
-    data = response.json()
-    progress = data["progress"]
+    assert data["question"]["difficulty"] in ["easy", "medium"]  # Should start appropriately
     
     # Should show correct initial state
-    assert progress["answered"] == 0
-    assert progress["total_questions"] > 0
+    assert data["progress"]["answered"] == 0
+    assert data["progress"]["total_questions"] > 0
 
 
-def test_adaptive_quiz_completion():
+async def test_adaptive_quiz_completion(async_client, auth_headers):
     """Test adaptive quiz completion detection."""
-    headers = get_auth_headers()
     
     # Create quiz with only 1 question for easy completion testing
     quiz_data = {
@@ -130,11 +125,11 @@ def test_adaptive_quiz_completion():
         "adaptive": True
     }
     
-    response = client.post("/quizzes", json=quiz_data, headers=headers)
+    response = await async_client.post("/quizzes", json=quiz_data, headers=auth_headers)
     quiz_id = response.json()["id"]
     
     # Start adaptive session
-    next_response = client.post(f"/quizzes/{quiz_id}/next", json={}, headers=headers)
+    next_response = await async_client.post(f"/quizzes/{quiz_id}/next", json={}, headers=auth_headers)
     assert next_response.status_code == 200
     
     # Should get the single question
@@ -142,36 +137,34 @@ def test_adaptive_quiz_completion():
     assert data["question"] is not None
     assert data["is_complete"] == False
     
-    # Submit answer to complete quiz
-    questions_response = client.get(f"/quizzes/{quiz_id}/questions", headers=headers)
-    questions = questions_response.json()
-    
+    # Submit answer to complete quiz, reusing the question handed out by /next
+    first_question = data["question"]
     submission_data = {
         "answers": [{
-            "question_id": questions[0]["id"],
-            "selected_option": questions[0]["options"][0]
+            "question_id": first_question["id"],
+            "selected_option": first_question["options"][0]
         }]
     }
     
-    submit_response = client.post(f"/quizzes/{quiz_id}/submit", json=submission_data, headers=headers)
+    submit_response = await async_client.post(f"/quizzes/{quiz_id}/submit", json=submission_data, headers=auth_headers)
     assert submit_response.status_code == 200
     
     # Now next question should indicate completion
-    next_response2 = client.post(f"/quizzes/{quiz_id}/next", json={}, headers=headers)
+    next_response2 = await async_client.post(f"/quizzes/{quiz_id}/next", json={}, headers=auth_headers)
     assert next_response2.status_code == 200
     
     data2 = next_response2.json()
-    # After submission, should show completion or no active session
-    assert data2["question"] is None or data2["is_complete"] == True
+    assert data2["question"] is None
+    assert data2["is_complete"] == True
+    assert data2["progress"]["answered"] == 1
 
 
-def test_adaptive_quiz_status():
+async def test_adaptive_quiz_status(async_client, auth_headers, seeded_adaptive_quiz):
     """Test adaptive quiz status endpoint."""
-    headers = get_auth_headers()
-    quiz_id = create_adaptive_quiz()
+    quiz_id = seeded_adaptive_quiz
     
     # Check status before starting
-    response = client.get(f"/quizzes/{quiz_id}/adaptive-status", headers=headers)
+    response = await async_client.get(f"/quizzes/{quiz_id}/adaptive-status", headers=auth_headers)
     assert response.status_code == 200
     
     data = response.json()
@@ -184,22 +177,43 @@ def test_adaptive_quiz_status():
     if not data["has_active_session"]:
         assert "message" in data
     
-    # Start session and check status
-    client.post(f"/quizzes/{quiz_id}/next", json={}, headers=headers)
-    
-    status_response = client.get(f"/quizzes/{quiz_id}/adaptive-status", headers=headers)
+    # Start session and check status concurrently
+    status_response, next_response = await asyncio.gather(
+        async_client.get(f"/quizzes/{quiz_id}/adaptive-status", headers=auth_headers),
+        async_client.post(f"/quizzes/{quiz_id}/next", json={}, headers=auth_headers),
+    )
+    assert next_response.status_code == 200
     status_data = status_response.json()
     
-    # Should now have active session
+    # Session may or may not be visible yet depending on which request landed first
     if status_data["has_active_session"]:
         assert "submission_id" in status_data
         assert "progress" in status_data
         assert "started_at" in status_data
 
 
-def test_non_adaptive_quiz_next_endpoint():
+async def test_adaptive_next_opens_session(async_client, auth_headers):
+    """Test that the session started by /next is visible to the status endpoint."""
+    quiz_id = await create_adaptive_quiz(async_client, auth_headers)
+    
+    next_response = await async_client.post(f"/quizzes/{quiz_id}/next", json={}, headers=auth_headers)
+    assert next_response.status_code == 200
+    
+    status_response = await async_client.get(f"/quizzes/{quiz_id}/adaptive-status", headers=auth_headers)
+    assert status_response.status_code == 200
+    
+    status_data = status_response.json()
+    assert status_data["has_active_session"] == True
+    assert status_data["progress"]["answered"] == 0
+    
+    # A second /next resumes the same session instead of opening another
+    await async_client.post(f"/quizzes/{quiz_id}/next", json={}, headers=auth_headers)
+    status_response2 = await async_client.get(f"/quizzes/{quiz_id}/adaptive-status", headers=auth_headers)
+    assert status_response2.json()["submission_id"] == status_data["submission_id"]
+
+
+async def test_non_adaptive_quiz_next_endpoint(async_client, auth_headers):
     """Test that next endpoint rejects non-adaptive quizzes."""
-    headers = get_auth_headers()
     
     # Create regular (non-adaptive) quiz
     quiz_data = {
@@ -212,28 +226,28 @@ def test_non_adaptive_quiz_next_endpoint():
         "adaptive": False
     }
     
-    response = client.post("/quizzes", json=quiz_data, headers=headers)
+    response = await async_client.post("/quizzes", json=quiz_data, headers=auth_headers)
     quiz_id = response.json()["id"]
     
     # Try to use adaptive endpoint
-    next_response = client.post(f"/quizzes/{quiz_id}/next", json={}, headers=headers)
+    next_response = await async_client.post(f"/quizzes/{quiz_id}/next", json={}, headers=auth_headers)
     assert next_response.status_code == 422
     
     error_data = next_response.json()
     assert "adaptive" in error_data["error"]["message"].lower()
 
 
-def test_adaptive_nonexistent_quiz():
+async def test_adaptive_nonexistent_quiz(async_client, auth_headers):
     """Test adaptive endpoints with nonexistent quiz."""
-    headers = get_auth_headers()
-    
-    # Next question for nonexistent quiz
-    response = client.post("/quizzes/99999/next", json={}, headers=headers)
-    assert response.status_code == 404
     
-    # Status for nonexistent quiz
-    response = client.get("/quizzes/99999/adaptive-status", headers=headers)
-    assert response.status_code == 404
+    next_response, status_response = await asyncio.gather(
+        # Next question for nonexistent quiz
+        async_client.post("/quizzes/99999/next", json={}, headers=auth_headers),
+        # Status for nonexistent quiz
+        async_client.get("/quizzes/99999/adaptive-status", headers=auth_headers),
+    )
+    assert next_response.status_code == 404
+    assert status_response.status_code == 404
 
 
 def test_adaptive_performance_boundaries():
@@ -256,14 +270,15 @@ def test_adaptive_performance_boundaries():
     assert service._step_down_difficulty("easy") == "easy"  # Can't go lower
 
 
-def test_adaptive_without_authentication():
+async def test_adaptive_without_authentication(async_client, auth_headers):
     """Test that adaptive endpoints require authentication."""
-    quiz_id = create_adaptive_quiz()
-    
-    # Next question without auth
-    response = client.post(f"/quizzes/{quiz_id}/next", json={})
-    assert response.status_code == 422  # Missing authorization header
-    
-    # Status without auth
-    response = client.get(f"/quizzes/{quiz_id}/adaptive-status")
-    assert response.status_code == 422  # Missing authorization header
+    quiz_id = await create_adaptive_quiz(async_client, auth_headers)
+    
+    next_response, status_response = await asyncio.gather(
+        # Next question without auth
+        async_client.post(f"/quizzes/{quiz_id}/next", json={}),
+        # Status without auth
+        async_client.get(f"/quizzes/{quiz_id}/adaptive-status"),
+    )
+    assert next_response.status_code == 422  # Missing authorization header
+    assert status_response.status_code == 422  # Missing authorization header
@@ -1,15 +1,11 @@
 """Authentication tests."""
 
 import pytest
-from fastapi.testclient import TestClient
 
-from app.main import app
 from app.core.security import create_access_token
 
-client = TestClient(app)
 
-
-def test_login_success():
+def test_login_success(client):
     """Test successful login with any credentials."""
     login_data = {
         "username": "testuser",
@@ -26,7 +22,7 @@ def test_login_success():
     assert isinstance(data["expires_in"], int)
 
 
-def test_login_with_different_credentials():
+def test_login_with_different_credentials(client):
     """Test login works with any username/password in development."""
     login_data = {
         "username": "anotheruser",
@@ -40,7 +36,7 @@ def test_login_with_different_credentials():
     assert "access_token" in data
 
 
-def test_login_validation():
+def test_login_validation(client):
     """Test login validation for missing fields."""
     # Missing password
     response = client.post("/auth/login", json={"username": "test"})
@@ -55,7 +51,7 @@ def test_login_validation():
     assert response.status_code == 422
 
 
-def test_protected_route_without_token():
+def test_protected_route_without_token(client):
     """Test that protected routes block requests without token."""
     response = client.post("/quizzes", json={
         "subject": "Math",
@@ -68,7 +64,7 @@ def test_protected_route_without_token():
     assert response.status_code == 422  # Missing Authorization header
 
 
-def test_protected_route_with_invalid_token():
+def test_protected_route_with_invalid_token(client):
     """Test that protected routes block requests with invalid token."""
     headers = {"Authorization": "Bearer invalid_token"}
     response = client.post("/quizzes", json={
@@ -82,17 +78,9 @@ def test_protected_route_with_invalid_token():
     assert response.status_code == 401
 
 
-def test_protected_route_with_valid_token():
+def test_protected_route_with_valid_token(client, valid_token):
     """Test that protected routes work with valid token."""
-    # First login to get token
-    login_response = client.post("/auth/login", json={
-        "username": "testuser",
-        "password": "testpass"
-    })
-    token = login_response.json()["access_token"]
-    
-    # Use token to access protected route
-    headers = {"Authorization": f"Bearer {token}"}
+    headers = {"Authorization": f"Bearer {valid_token}"}
     response = client.post("/quizzes", json={
         "subject": "Math",
         "grade_level": "8",
@@ -116,7 +104,7 @@ def test_jwt_token_creation():
     assert "." in token  # JWT has dots
 
 
-def test_invalid_authorization_header_format():
+def test_invalid_authorization_header_format(client):
     """Test invalid authorization header formats."""
     # Missing 'Bearer ' prefix
     headers = {"Authorization": "invalid_format_token"}
@@ -1,15 +1,10 @@
 """Health endpoint tests."""
 
 import pytest
-from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.main import app
 
-client = TestClient(app)
-
-
-def test_health_check():
+def test_health_check(client):
     """Test basic health check endpoint."""
     response = client.get("/healthz")
     assert response.status_code == 200
@@ -19,7 +14,7 @@ def test_health_check():
 
 
 @pytest.mark.asyncio
-async def test_readiness_check_with_db():
+async def test_readiness_check_with_db(client):
     """Test readiness check with database connectivity."""
     response = client.get("/readyz")
     # Should be 200 if database is connected
@@ -29,7 +24,7 @@ async def test_readiness_check_with_db():
     assert "database" in data
 
 
-def test_root_endpoint():
+def test_root_endpoint(client):
     """Test root endpoint."""
     response = client.get("/")
     assert response.status_code == 200
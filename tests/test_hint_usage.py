@@ -0,0 +1,95 @@
+"""Hint usage store tests."""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from app.core.config import Settings
+from app.services.hint_usage import HintUsageStore
+
+
+class FakeClock:
+    """Monotonic clock the tests advance by hand."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+def test_refill_rate_defaults_to_setting(monkeypatch):
+    """Test that HINT_REFILL_PER_SECOND sets the refill rate of a default store."""
+    monkeypatch.setenv("HINT_REFILL_PER_SECOND", "0.25")
+    
+    with patch("app.services.hint_usage.get_settings", return_value=Settings()):
+        assert HintUsageStore().refill_per_second == 0.25
+
+
+def test_reserve_counts_down_to_the_limit():
+    """Test that a bucket hands out exactly ``limit`` hints without refill."""
+    store = HintUsageStore(refill_per_second=0)
+    
+    assert [store.reserve(1, 1, limit=3) for _ in range(4)] == [1, 2, 3, None]
+
+
+def test_tokens_refill_over_time():
+    """Test that an empty bucket regains tokens as time passes, up to its capacity."""
+    clock = FakeClock()
+    store = HintUsageStore(refill_per_second=0.5)
+    
+    with patch("app.services.hint_usage.time.monotonic", clock):
+        for _ in range(3):
+            store.reserve(1, 1, limit=3)
+        assert store.reserve(1, 1, limit=3) is None
+        
+        # Half a token per second: one token back after two seconds
+        clock.now += 2
+        assert store.reserve(1, 1, limit=3) == 3
+        assert store.reserve(1, 1, limit=3) is None
+        
+        # A long idle period refills to capacity and no further
+        clock.now += 3600
+        assert [store.reserve(1, 1, limit=3) for _ in range(4)] == [1, 2, 3, None]
+
+
+def test_release_returns_a_token_without_exceeding_capacity():
+    """Test that release gives a reserved token back but never overfills the bucket."""
+    store = HintUsageStore(refill_per_second=0)
+    
+    store.reserve(1, 1, limit=3)
+    store.reserve(1, 1, limit=3)
+    store.release(1, 1)
+    assert store.reserve(1, 1, limit=3) == 2
+    
+    # Releasing more than was reserved leaves the bucket full
+    for _ in range(5):
+        store.release(1, 1)
+    assert [store.reserve(1, 1, limit=3) for _ in range(4)] == [1, 2, 3, None]
+    
+    # Releasing a bucket that was never used is a no-op
+    store.release(2, 1)
+    assert store.reserve(2, 1, limit=3) == 1
+
+
+def test_reset_clears_only_that_bucket():
+    """Test that reset forgets one user's usage for one question."""
+    store = HintUsageStore(refill_per_second=0)
+    for _ in range(3):
+        store.reserve(1, 1, limit=3)
+        store.reserve(2, 1, limit=3)
+    
+    store.reset(1, 1)
+    
+    assert store.reserve(1, 1, limit=3) == 1
+    assert store.reserve(2, 1, limit=3) is None
+
+
+def test_concurrent_reserve_never_exceeds_capacity():
+    """Test that concurrent reservations on one bucket hand out at most ``limit`` tokens."""
+    store = HintUsageStore(refill_per_second=0)
+    
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda _: store.reserve(1, 1, limit=3), range(200)))
+    
+    granted = [r for r in results if r is not None]
+    assert sorted(granted) == [1, 2, 3]
@@ -1,28 +1,88 @@
 """History filtering tests."""
 
 import pytest
-from fastapi.testclient import TestClient
 from datetime import datetime, timezone
+from sqlalchemy import delete, insert
 
-from app.main import app
+from app.models.answer import Answer
+from app.models.evaluation import Evaluation
+from app.models.quiz import Quiz
+from app.models.submission import Submission
+from app.services.testing import seed_submission
 
-client = TestClient(app)
 
+@pytest.fixture(autouse=True)
+def empty_history(db_txn):
+    """Start every test from an empty history; all changes are rolled back after it."""
+    
+    async def clear(session):
+        # Hides submissions committed by other modules for the duration of the test
+        for model in (Evaluation, Answer, Submission):
+            await session.execute(delete(model))
+    
+    db_txn(clear)
+
+
+async def insert_submissions(session, user_id, count, subject="Pagination", grade_level="8", percentage=100.0):
+    """Add one quiz and bulk-insert ``count`` completed submissions to it."""
+    quiz = Quiz(
+        title=f"{subject} - {grade_level} Quiz",
+        subject=subject,
+        grade_level=grade_level,
+        num_questions=2,
+        difficulty="easy",
+        topics=["test_topic"],
+        question_types=["MCQ"],
+        creator_id=user_id,
+    )
+    session.add(quiz)
+    await session.flush()
+    
+    now = datetime.now(timezone.utc)
+    await session.execute(insert(Submission), [
+        {
+            "user_id": user_id,
+            "quiz_id": quiz.id,
+            "is_completed": True,
+            "started_at": now,
+            "submitted_at": now,
+            "total_score": 2.0 * percentage / 100,
+            "max_possible_score": 2.0,
+            "percentage": percentage,
+        }
+        for _ in range(count)
+    ])
 
-def get_auth_headers():
-    """Helper to get authentication headers."""
-    login_response = client.post("/auth/login", json={
-        "username": "testuser",
-        "password": "testpass"
-    })
-    token = login_response.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
 
+@pytest.fixture
+def many_submissions(db_txn, test_user_id):
+    """Five completed submissions for the test user, bulk-inserted in the test transaction."""
+    db_txn(lambda session: insert_submissions(session, test_user_id, 5))
 
-def create_and_submit_quiz(subject, grade_level, score_range="good"):
-    """Helper to create and submit a quiz for testing history."""
-    headers = get_auth_headers()
+
+@pytest.fixture
+def todays_submission(db_txn, test_user_id):
+    """One submission made just now, for the date filter tests."""
+    db_txn(lambda session: insert_submissions(session, test_user_id, 1, subject="DateTest"))
+
+
+@pytest.fixture
+def submitted_quiz(db_txn, test_user_id):
+    """Seed a graded submission for the test user in one service-layer call.
+    
+    Returns ``seed(subject, grade_level, score_range="good") -> quiz_id``.
+    """
     
+    def seed(subject, grade_level, score_range="good"):
+        return db_txn(lambda session: seed_submission(
+            session, test_user_id, subject, grade_level, score_range
+        ))
+    
+    return seed
+
+
+def create_and_submit_quiz(client, headers, subject, grade_level, score_range="good"):
+    """Helper to create and submit a quiz over HTTP, end to end."""
     quiz_data = {
         "subject": subject,
         "grade_level": grade_level,
@@ -62,15 +122,13 @@ def create_and_submit_quiz(subject, grade_level, score_range="good"):
     return quiz_id
 
 
-def test_get_history_basic():
+def test_get_history_basic(client, auth_headers):
     """Test basic history retrieval."""
-    headers = get_auth_headers()
-    
     # Create some test submissions
-    create_and_submit_quiz("Mathematics", "8")
-    create_and_submit_quiz("Science", "9")
+    create_and_submit_quiz(client, auth_headers, "Mathematics", "8")
+    create_and_submit_quiz(client, auth_headers, "Science", "9")
     
-    response = client.get("/quizzes/history", headers=headers)
+    response = client.get("/quiz-history", headers=auth_headers)
     assert response.status_code == 200
     
     data = response.json()
@@ -82,8 +140,8 @@ def test_get_history_basic():
     assert "has_prev" in data
     assert "filters_applied" in data
     
-    # Should have submissions
-    assert len(data["submissions"]) >= 2
+    # Should have exactly this test's submissions
+    assert len(data["submissions"]) == 2
     
     # Check submission structure
     for submission in data["submissions"]:
@@ -96,130 +154,94 @@ def test_get_history_basic():
         assert "created_at" in submission
 
 
-def test_history_filter_by_subject():
+def test_history_filter_by_subject(client, auth_headers, submitted_quiz):
     """Test filtering history by subject."""
-    headers = get_auth_headers()
-    
     # Create quizzes with different subjects
-    create_and_submit_quiz("Physics", "10")
-    create_and_submit_quiz("Chemistry", "10")
+    submitted_quiz("Physics", "10")
+    submitted_quiz("Chemistry", "10")
     
     # Filter by Physics
-    response = client.get("/quizzes/history?subject=Physics", headers=headers)
+    response = client.get("/quiz-history?subject=Physics", headers=auth_headers)
     assert response.status_code == 200
     
     data = response.json()
-    physics_submissions = data["submissions"]
     
-    # All results should be Physics
-    for submission in physics_submissions:
-        assert submission["subject"] == "Physics"
+    # Only the Physics submission matches
+    assert data["total"] == 1
+    assert [s["subject"] for s in data["submissions"]] == ["Physics"]
     
     assert data["filters_applied"]["subject"] == "Physics"
 
 
-def test_history_filter_by_grade():
+def test_history_filter_by_grade(client, auth_headers, submitted_quiz):
     """Test filtering history by grade level."""
-    headers = get_auth_headers()
-    
     # Create quizzes with different grades
-    create_and_submit_quiz("Math", "7")
-    create_and_submit_quiz("Math", "8")
+    submitted_quiz("Math", "7")
+    submitted_quiz("Math", "8")
     
     # Filter by grade 7
-    response = client.get("/quizzes/history?grade=7", headers=headers)
+    response = client.get("/quiz-history?grade=7", headers=auth_headers)
     assert response.status_code == 200
     
     data = response.json()
-    grade7_submissions = data["submissions"]
     
-    # All results should be grade 7
-    for submission in grade7_submissions:
-        assert submission["grade_level"] == "7"
+    # Only the grade 7 submission matches
+    assert data["total"] == 1
+    assert [s["grade_level"] for s in data["submissions"]] == ["7"]
     
     assert data["filters_applied"]["grade"] == "7"
 
 
-def test_history_filter_by_marks():
+def test_history_filter_by_marks(client, auth_headers, db_txn, test_user_id):
     """Test filtering history by marks range."""
-    headers = get_auth_headers()
-    
-    # Create quizzes with different expected scores
-    create_and_submit_quiz("Test_High", "8", "good")
-    create_and_submit_quiz("Test_Low", "8", "poor")
+    # Submissions with known scores on either side of the range
+    db_txn(lambda session: insert_submissions(session, test_user_id, 2, subject="Test_High", percentage=90.0))
+    db_txn(lambda session: insert_submissions(session, test_user_id, 3, subject="Test_Low", percentage=25.0))
     
     # Filter by high marks (80-100%)
-    response = client.get("/quizzes/history?min_marks=80&max_marks=100", headers=headers)
+    response = client.get("/quiz-history?min_marks=80&max_marks=100", headers=auth_headers)
     assert response.status_code == 200
     
     data = response.json()
     assert data["filters_applied"]["min_marks"] == "80.0"
     assert data["filters_applied"]["max_marks"] == "100.0"
     
-    # Check that returned submissions have percentage in range
-    for submission in data["submissions"]:
-        if submission["percentage"] is not None:
-            assert 80 <= submission["percentage"] <= 100
-
-
-def test_history_date_parsing_iso():
-    """Test date parsing with ISO format."""
-    headers = get_auth_headers()
-    
-    # Create a submission
-    create_and_submit_quiz("DateTest", "8")
-    
-    # Test with ISO date format
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    
-    response = client.get(f"/quizzes/history?from_date={today}", headers=headers)
-    assert response.status_code == 200
-    
-    data = response.json()
-    assert data["filters_applied"]["from_date"] == today
+    # Only the two high-scoring submissions fall in range
+    assert data["total"] == 2
+    assert [s["subject"] for s in data["submissions"]] == ["Test_High", "Test_High"]
 
 
-def test_history_date_parsing_ddmmyyyy():
-    """Test date parsing with DD/MM/YYYY format."""
-    headers = get_auth_headers()
-    
-    # Create a submission
-    create_and_submit_quiz("DateTest2", "8")
-    
-    # Test with DD/MM/YYYY format
-    today = datetime.now(timezone.utc)
-    date_str = today.strftime("%d/%m/%Y")
+@pytest.mark.parametrize("fmt", ["%Y-%m-%d", "%d/%m/%Y"], ids=["iso", "ddmmyyyy"])
+def test_history_date_parsing(client, auth_headers, todays_submission, fmt):
+    """Test date parsing with ISO and DD/MM/YYYY formats."""
+    date_str = datetime.now(timezone.utc).strftime(fmt)
     
-    response = client.get(f"/quizzes/history?from_date={date_str}", headers=headers)
+    response = client.get(f"/quiz-history?from_date={date_str}", headers=auth_headers)
     assert response.status_code == 200
     
     data = response.json()
     assert data["filters_applied"]["from_date"] == date_str
+    
+    # Today's submission falls inside the range
+    assert data["total"] == 1
 
 
-def test_history_pagination():
+def test_history_pagination(client, auth_headers, many_submissions):
     """Test history pagination."""
-    headers = get_auth_headers()
-    
-    # Create multiple submissions
-    for i in range(5):
-        create_and_submit_quiz(f"Subject{i}", "8")
-    
     # Test first page
-    response = client.get("/quizzes/history?limit=2&offset=0", headers=headers)
+    response = client.get("/quiz-history?limit=2&offset=0", headers=auth_headers)
     assert response.status_code == 200
     
     data = response.json()
-    assert len(data["submissions"]) <= 2
+    assert len(data["submissions"]) == 2
+    assert data["total"] == 5
     assert data["limit"] == 2
     assert data["offset"] == 0
     assert data["has_prev"] == False
-    
-    if data["total"] > 2:
-        assert data["has_next"] == True
+    assert data["has_next"] == True
     
     # Test second page
-    response = client.get("/quizzes/history?limit=2&offset=2", headers=headers)
+    response = client.get("/quiz-history?limit=2&offset=2", headers=auth_headers)
     assert response.status_code == 200
     
     data = response.json()
@@ -227,17 +249,15 @@ def test_history_pagination():
     assert data["has_prev"] == True
 
 
-def test_history_multiple_filters():
+def test_history_multiple_filters(client, auth_headers, submitted_quiz):
     """Test applying multiple filters together."""
-    headers = get_auth_headers()
-    
     # Create specific quiz
-    create_and_submit_quiz("FilterTest", "9")
+    submitted_quiz("FilterTest", "9")
     
     # Apply multiple filters
     response = client.get(
-        "/quizzes/history?subject=FilterTest&grade=9&min_marks=0&max_marks=100",
-        headers=headers
+        "/quiz-history?subject=FilterTest&grade=9&min_marks=0&max_marks=100",
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -249,18 +269,16 @@ def test_history_multiple_filters():
     assert filters["min_marks"] == "0.0"
     assert filters["max_marks"] == "100.0"
     
-    # Results should match all filters
-    for submission in data["submissions"]:
-        assert submission["subject"] == "FilterTest"
-        assert submission["grade_level"] == "9"
+    # The one seeded submission matches all filters
+    assert data["total"] == 1
+    assert data["submissions"][0]["subject"] == "FilterTest"
+    assert data["submissions"][0]["grade_level"] == "9"
 
 
-def test_history_invalid_date_format():
+def test_history_invalid_date_format(client, auth_headers):
     """Test that invalid date formats are handled gracefully."""
-    headers = get_auth_headers()
-    
     # Invalid date format should not cause error, just be ignored
-    response = client.get("/quizzes/history?from_date=invalid-date", headers=headers)
+    response = client.get("/quiz-history?from_date=invalid-date", headers=auth_headers)
     assert response.status_code == 200
     
     data = response.json()
@@ -268,29 +286,25 @@ def test_history_invalid_date_format():
     assert "from_date" not in data["filters_applied"]
 
 
-def test_history_validation():
+def test_history_validation(client, auth_headers):
     """Test history parameter validation."""
-    headers = get_auth_headers()
-    
     # Invalid marks range
-    response = client.get("/quizzes/history?min_marks=150", headers=headers)
+    response = client.get("/quiz-history?min_marks=150", headers=auth_headers)
     assert response.status_code == 422
     
     # Invalid limit
-    response = client.get("/quizzes/history?limit=1000", headers=headers)
+    response = client.get("/quiz-history?limit=1000", headers=auth_headers)
     assert response.status_code == 422
     
     # Negative offset
-    response = client.get("/quizzes/history?offset=-1", headers=headers)
+    response = client.get("/quiz-history?offset=-1", headers=auth_headers)
     assert response.status_code == 422
 
 
-def test_history_empty_results():
-    """Test history with filters that return no results."""
-    headers = get_auth_headers()
-    
-    # Filter for non-existent subject
-    response = client.get("/quizzes/history?subject=NonExistentSubject", headers=headers)
+def test_history_empty_results(client, auth_headers):
+    """Test history with no submissions."""
+    # Nothing persists between tests, so the unfiltered history is empty
+    response = client.get("/quiz-history", headers=auth_headers)
     assert response.status_code == 200
     
     data = response.json()
@@ -300,7 +314,7 @@ def test_history_empty_results():
     assert data["has_prev"] == False
 
 
-def test_history_without_authentication():
+def test_history_without_authentication(client):
     """Test that history requires authentication."""
-    response = client.get("/quizzes/history")
+    response = client.get("/quiz-history")
     assert response.status_code == 422  # Missing authorization header
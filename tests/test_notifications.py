@@ -0,0 +1,112 @@
+"""Notification service tests."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiosmtplib
+import pytest
+
+from app.services.notifications import NotificationService
+
+
+def make_smtp():
+    """Mock SMTP client that reports itself connected once connected."""
+    smtp = MagicMock()
+    smtp.is_connected = False
+    
+    async def connect():
+        smtp.is_connected = True
+    
+    smtp.connect = AsyncMock(side_effect=connect)
+    smtp.send_message = AsyncMock()
+    smtp.quit = AsyncMock()
+    return smtp
+
+
+@pytest.fixture
+def smtp_factory():
+    """Patch aiosmtplib.SMTP so every connection the service opens is a fresh mock."""
+    with patch("app.services.notifications.aiosmtplib.SMTP", side_effect=lambda **kwargs: make_smtp()) as factory:
+        yield factory
+
+
+@pytest.fixture
+def one_shot_send():
+    """Patch the one-shot aiosmtplib.send fallback."""
+    with patch("app.services.notifications.aiosmtplib.send", new_callable=AsyncMock) as send:
+        yield send
+
+
+async def send(service):
+    """Send a small email through the service."""
+    await service._send_email(
+        to_email="student@example.com",
+        subject="Quiz Results",
+        html_content="<p>Results</p>",
+        text_content="Results",
+    )
+
+
+async def test_first_send_opens_connection_and_reuses_it(smtp_factory, one_shot_send):
+    """Test that the connection is opened on first send and kept for the next ones."""
+    service = NotificationService()
+    
+    await send(service)
+    await send(service)
+    
+    assert smtp_factory.call_count == 1
+    smtp = service._smtp
+    assert smtp.connect.await_count == 1
+    assert smtp.send_message.await_count == 2
+    one_shot_send.assert_not_awaited()
+
+
+async def test_stale_connection_falls_back_and_reopens(smtp_factory, one_shot_send):
+    """Test that a dropped session is resent one-shot and reopened by the next send."""
+    service = NotificationService()
+    await send(service)
+    stale = service._smtp
+    stale.send_message.side_effect = aiosmtplib.SMTPServerDisconnected("idle timeout")
+    
+    await send(service)
+    
+    one_shot_send.assert_awaited_once()
+    stale.close.assert_called_once()
+    assert service._smtp is None
+    
+    await send(service)
+    
+    assert smtp_factory.call_count == 2
+    assert service._smtp is not stale
+    service._smtp.send_message.assert_awaited_once()
+    one_shot_send.assert_awaited_once()
+
+
+async def test_unreachable_server_falls_back_to_one_shot(smtp_factory, one_shot_send):
+    """Test that a failed connect still sends the email over a one-shot connection."""
+    smtp_factory.side_effect = None
+    smtp = make_smtp()
+    smtp.connect.side_effect = OSError("connection refused")
+    smtp_factory.return_value = smtp
+    service = NotificationService()
+    
+    await send(service)
+    
+    one_shot_send.assert_awaited_once()
+    assert one_shot_send.await_args.kwargs["timeout"] > 0
+    assert service._smtp is None
+
+
+async def test_close_quits_open_connection(smtp_factory, one_shot_send):
+    """Test that close quits the persistent connection and forgets it."""
+    service = NotificationService()
+    await send(service)
+    smtp = service._smtp
+    
+    await service.close()
+    
+    smtp.quit.assert_awaited_once()
+    assert service._smtp is None
+    
+    # Closing again is a no-op
+    await service.close()
+    smtp.quit.assert_awaited_once()
@@ -1,27 +1,10 @@
 """Quiz generation tests."""
 
 import pytest
-from fastapi.testclient import TestClient
 
-from app.main import app
 
-client = TestClient(app)
-
-
-def get_auth_headers():
-    """Helper to get authentication headers."""
-    login_response = client.post("/auth/login", json={
-        "username": "testuser",
-        "password": "testpass"
-    })
-    token = login_response.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
-
-
-def test_create_quiz_success():
+def test_create_quiz_success(client, auth_headers):
     """Test successful quiz creation."""
-    headers = get_auth_headers()
-    
     quiz_data = {
         "subject": "Mathematics",
         "grade_level": "8",
@@ -33,7 +16,7 @@ def test_create_quiz_success():
         "adaptive": False
     }
     
-    response = client.post("/quizzes", json=quiz_data, headers=headers)
+    response = client.post("/quizzes", json=quiz_data, headers=auth_headers)
     assert response.status_code == 200
     
     data = response.json()
@@ -48,12 +31,16 @@ def test_create_quiz_success():
     assert "id" in data
     assert "title" in data
     assert data["is_published"] == True
+    
+    # The generated questions come back without their answers
+    assert len(data["questions"]) == 5
+    for question in data["questions"]:
+        assert "correct_answer" not in question
+        assert "explanation" not in question
 
 
-def test_create_adaptive_quiz():
+def test_create_adaptive_quiz(client, auth_headers):
     """Test creating an adaptive quiz."""
-    headers = get_auth_headers()
-    
     quiz_data = {
         "subject": "Science",
         "grade_level": "10",
@@ -64,7 +51,7 @@ def test_create_adaptive_quiz():
         "adaptive": True
     }
     
-    response = client.post("/quizzes", json=quiz_data, headers=headers)
+    response = client.post("/quizzes", json=quiz_data, headers=auth_headers)
     assert response.status_code == 200
     
     data = response.json()
@@ -72,10 +59,8 @@ def test_create_adaptive_quiz():
     assert data["difficulty"] == "adaptive"
 
 
-def test_get_quiz_by_id():
+def test_get_quiz_by_id(client, auth_headers):
     """Test retrieving quiz by ID."""
-    headers = get_auth_headers()
-    
     # First create a quiz
     quiz_data = {
         "subject": "History",
@@ -86,11 +71,11 @@ def test_get_quiz_by_id():
         "question_types": ["MCQ"]
     }
     
-    create_response = client.post("/quizzes", json=quiz_data, headers=headers)
+    create_response = client.post("/quizzes", json=quiz_data, headers=auth_headers)
     quiz_id = create_response.json()["id"]
     
     # Get the quiz
-    response = client.get(f"/quizzes/{quiz_id}", headers=headers)
+    response = client.get(f"/quizzes/{quiz_id}", headers=auth_headers)
     assert response.status_code == 200
     
     data = response.json()
@@ -98,10 +83,8 @@ def test_get_quiz_by_id():
     assert data["subject"] == "History"
 
 
-def test_get_quiz_questions():
+def test_get_quiz_questions(client, auth_headers):
     """Test retrieving quiz questions without revealing answers."""
-    headers = get_auth_headers()
-    
     # Create a quiz
     quiz_data = {
         "subject": "English",
@@ -112,11 +95,11 @@ def test_get_quiz_questions():
         "question_types": ["MCQ", "TF"]
     }
     
-    create_response = client.post("/quizzes", json=quiz_data, headers=headers)
+    create_response = client.post("/quizzes", json=quiz_data, headers=auth_headers)
     quiz_id = create_response.json()["id"]
     
     # Get questions
-    response = client.get(f"/quizzes/{quiz_id}/questions", headers=headers)
+    response = client.get(f"/quizzes/{quiz_id}/questions", headers=auth_headers)
     assert response.status_code == 200
     
     questions = response.json()
@@ -136,57 +119,38 @@ def test_get_quiz_questions():
         assert "explanation" not in question
 
 
-def test_quiz_validation():
+VALID_QUIZ_DATA = {
+    "subject": "Math",
+    "grade_level": "8",
+    "num_questions": 5,
+    "difficulty": "medium",
+    "topics": ["algebra"],
+    "question_types": ["MCQ"]
+}
+
+
+@pytest.mark.parametrize("overrides", [
+    {"difficulty": "invalid_difficulty"},  # Invalid difficulty
+    {"question_types": ["INVALID_TYPE"]},  # Invalid question type
+    {"num_questions": 100},  # Too many questions
+    {"topics": []},  # Empty topics
+], ids=["difficulty", "question_type", "num_questions", "topics"])
+def test_quiz_validation(client, auth_headers, overrides):
     """Test quiz creation validation."""
-    headers = get_auth_headers()
-    
-    # Invalid difficulty
-    quiz_data = {
-        "subject": "Math",
-        "grade_level": "8",
-        "num_questions": 5,
-        "difficulty": "invalid_difficulty",
-        "topics": ["algebra"],
-        "question_types": ["MCQ"]
-    }
+    quiz_data = {**VALID_QUIZ_DATA, **overrides}
     
-    response = client.post("/quizzes", json=quiz_data, headers=headers)
-    assert response.status_code == 422
-    
-    # Invalid question type
-    quiz_data["difficulty"] = "medium"
-    quiz_data["question_types"] = ["INVALID_TYPE"]
-    
-    response = client.post("/quizzes", json=quiz_data, headers=headers)
-    assert response.status_code == 422
-    
-    # Too many questions
-    quiz_data["question_types"] = ["MCQ"]
-    quiz_data["num_questions"] = 100  # Over limit
-    
-    response = client.post("/quizzes", json=quiz_data, headers=headers)
-    assert response.status_code == 422
-    
-    # Empty topics
-    quiz_data["num_questions"] = 5
-    quiz_data["topics"] = []
-    
-    response = client.post("/quizzes", json=quiz_data, headers=headers)
+    response = client.post("/quizzes", json=quiz_data, headers=auth_headers)
     assert response.status_code == 422
 
 
-def test_get_nonexistent_quiz():
+def test_get_nonexistent_quiz(client, auth_headers):
     """Test getting a quiz that doesn't exist."""
-    headers = get_auth_headers()
-    
-    response = client.get("/quizzes/99999", headers=headers)
+    response = client.get("/quizzes/99999", headers=auth_headers)
     assert response.status_code == 404
 
 
-def test_quiz_creation_deterministic():
+def test_quiz_creation_deterministic(client, auth_headers):
     """Test that quiz creation with same parameters produces consistent results."""
-    headers = get_auth_headers()
-    
     quiz_data = {
         "subject": "Test_Subject",
         "grade_level": "Test_Grade",
@@ -197,8 +161,8 @@ def test_quiz_creation_deterministic():
     }
     
     # Create two quizzes with identical parameters
-    response1 = client.post("/quizzes", json=quiz_data, headers=headers)
-    response2 = client.post("/quizzes", json=quiz_data, headers=headers)
+    response1 = client.post("/quizzes", json=quiz_data, headers=auth_headers)
+    response2 = client.post("/quizzes", json=quiz_data, headers=auth_headers)
     
     assert response1.status_code == 200
     assert response2.status_code == 200
@@ -207,8 +171,8 @@ def test_quiz_creation_deterministic():
     quiz2_id = response2.json()["id"]
     
     # Get questions for both quizzes
-    questions1 = client.get(f"/quizzes/{quiz1_id}/questions", headers=headers).json()
-    questions2 = client.get(f"/quizzes/{quiz2_id}/questions", headers=headers).json()
+    questions1 = client.get(f"/quizzes/{quiz1_id}/questions", headers=auth_headers).json()
+    questions2 = client.get(f"/quizzes/{quiz2_id}/questions", headers=auth_headers).json()
     
     # Should have same structure (MockProvider is deterministic)
     assert len(questions1) == len(questions2) == 3
@@ -0,0 +1,46 @@
+"""Startup script tests."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import psycopg
+import pytest
+
+import start
+
+
+def test_wait_for_database_stops_on_bad_password():
+    """Test that an authentication failure is not retried."""
+    error = psycopg.errors.lookup("28P01")("connection failed")
+    with patch("psycopg.connect", side_effect=error) as connect, \
+            patch("start.time.sleep") as sleep:
+        assert start.wait_for_database() is False
+    
+    assert connect.call_count == 1
+    sleep.assert_not_called()
+
+
+def test_wait_for_database_retries_when_unreachable():
+    """Test that a refused connection is retried until it succeeds."""
+    error = psycopg.OperationalError("connection failed: Connection refused")
+    with patch("psycopg.connect") as connect, patch("start.time.sleep"):
+        connect.side_effect = [error, error, connect.return_value]
+        assert start.wait_for_database() is True
+    
+    assert connect.call_count == 3
+
+
+@pytest.mark.parametrize("database_url", [
+    "postgres://quiz:secret@db:5432/quiz",
+    "postgresql://quiz:secret@db:5432/quiz",
+    "postgresql+psycopg://quiz:secret@db:5432/quiz",
+    "postgresql+asyncpg://quiz:secret@db:5432/quiz",
+])
+def test_wait_for_database_connects_with_libpq_dsn(database_url):
+    """Test that every accepted DATABASE_URL form reaches libpq as a plain postgresql:// DSN."""
+    settings = SimpleNamespace(database_url=database_url)
+    with patch("app.core.config.get_settings", return_value=settings), \
+            patch("psycopg.connect") as connect:
+        assert start.wait_for_database() is True
+    
+    connect.assert_called_once_with("postgresql://quiz:secret@db:5432/quiz")